@@ -1,5 +1,8 @@
-import argparse
+from __future__ import annotations
+
+import re
 import sys
+from typing import NoReturn
 
 from colorama import Fore, Style, init
 
@@ -9,30 +12,87 @@ from ._core import bumpuvError, update_version
 init()
 
 
+USAGE = "usage: bumpuv [-h] [-n] [version]"
+
+HELP = f"""{USAGE}
+
+Version bumping tool for Python projects using pyproject.toml
+
+positional arguments:
+  version        Version to set or bump type (major|minor|patch|bump)
+
+options:
+  -h, --help     show this help message and exit
+  -n, --dry-run  Show what would be done without making changes
+"""
+
+
+def _error(message: str) -> NoReturn:
+    """Print usage and an error message to stderr and exit like argparse."""
+    print(USAGE, file=sys.stderr)
+    print(f"bumpuv: error: {message}", file=sys.stderr)
+    sys.exit(2)
+
+
+_LONG_OPTIONS = ("--help", "--dry-run")
+_SHORT_OPTIONS = {"h": "--help", "n": "--dry-run"}
+
+# Arguments argparse treats as positional even though they start with "-"
+_NEGATIVE_NUMBER_RE = re.compile(r"^-\d+$|^-\d*\.\d+$")
+
+
+def _expand_option(arg: str) -> list[str] | None:
+    """Return the long options arg stands for, or None if unrecognized."""
+    if arg.startswith("--"):
+        # Unambiguous prefixes are accepted, as with argparse
+        matches = [opt for opt in _LONG_OPTIONS if opt.startswith(arg)]
+        return matches if len(matches) == 1 else None
+    # Short flags may be combined, e.g. -nh
+    if all(c in _SHORT_OPTIONS for c in arg[1:]):
+        return [_SHORT_OPTIONS[c] for c in arg[1:]]
+    return None
+
+
+def _parse(argv: list[str]) -> tuple[str, bool]:
+    """Parse command line arguments into (version, dry_run)."""
+    version: str | None = None
+    dry_run = False
+    unrecognized = []
+    positional_only = False
+    for arg in argv:
+        if arg == "--" and not positional_only:
+            positional_only = True
+        elif (
+            positional_only
+            or arg == "-"
+            or not arg.startswith("-")
+            or _NEGATIVE_NUMBER_RE.match(arg)
+        ):
+            if version is None:
+                version = arg
+            else:
+                unrecognized.append(arg)
+        else:
+            options = _expand_option(arg)
+            if options is None:
+                unrecognized.append(arg)
+                continue
+            for option in options:
+                if option == "--help":
+                    print(HELP, end="")
+                    sys.exit(0)
+                dry_run = True
+    if unrecognized:
+        _error(f"unrecognized arguments: {' '.join(unrecognized)}")
+    return "bump" if version is None else version, dry_run
+
+
 def main() -> None:
     """Main CLI entry point."""
-    parser = argparse.ArgumentParser(
-        prog="bumpuv",
-        description="Version bumping tool for Python projects using pyproject.toml",
-    )
-    parser.add_argument(
-        "version",
-        nargs="?",
-        default="bump",
-        help="Version to set or bump type (major|minor|patch|bump)",
-    )
-
-    parser.add_argument(
-        "-n",
-        "--dry-run",
-        action="store_true",
-        help="Show what would be done without making changes",
-    )
-
-    args = parser.parse_args()
+    version, dry_run = _parse(sys.argv[1:])
 
     try:
-        version_info = update_version(args.version, args.dry_run)
+        version_info = update_version(version, dry_run)
 
         # Display results
         print(f"Updated: {version_info.path}")
@@ -40,7 +100,7 @@ def main() -> None:
         print(f"Commit: {version_info.commit_message}")
         print(f"Tag: {version_info.tag}")
 
-        if args.dry_run:
+        if dry_run:
             print("(dry run - no changes made)")
 
     except bumpuvError as e:
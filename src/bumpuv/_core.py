@@ -1,26 +1,49 @@
+from __future__ import annotations
+
+import copy
+import os
+import re
 import subprocess
+import tempfile
+from collections import OrderedDict
 from dataclasses import dataclass
-from pathlib import Path
-
-import git
-from colorama import Fore, Style, init
-from packaging.version import InvalidVersion, Version
+from functools import total_ordering
+from typing import TYPE_CHECKING, Any, Callable
 
-try:
-    import tomllib
-except ImportError:
-    import tomli as tomllib  # type: ignore[import-not-found,no-redef]
-import tomli_w
+from colorama import Fore, Style
 
-# Initialize colorama
-init()
+if TYPE_CHECKING:
+    from packaging.version import Version
 
 # Tag prefix constants
 PRERELEASE_TAG_PREFIX = "test-"
 RELEASE_TAG_PREFIX = "v"
 
+# `version = "..."` inside the [project] table, not crossing the next table header.
+# Multi-line strings are not understood; see _find_project_version.
+_VERSION_RE = re.compile(
+    rb"^\[project\][ \t]*(?:#[^\n]*)?\r?\n(?:(?![ \t]*\[)[^\n]*\n)*?"
+    rb'[ \t]*version[ \t]*=[ \t]*"([^"\\\n]*)"',
+    re.MULTILINE,
+)
+
+# N.N.N with an optional aN/bN/rcN suffix, handled without packaging (ASCII digits
+# only; \d would also match other Unicode digits, which PEP 440 does not allow)
+_FAST_VERSION_RE = re.compile(r"^([0-9]+)\.([0-9]+)\.([0-9]+)(?:(a|b|rc)([0-9]+))?$")
+_PRE_ORDER = {"a": 0, "b": 1, "rc": 2}
+
+# Parsed pyproject.toml data keyed on path and stat fields, LRU ordered. st_ino and
+# st_ctime_ns catch a same-size replacement within one mtime tick.
+_PYPROJECT_CACHE: OrderedDict[tuple[str, int, int, int, int], dict[str, Any]] = (
+    OrderedDict()
+)
+_PYPROJECT_CACHE_SIZE = 8
 
-@dataclass
+# packaging.version.Version, imported on first use (see _version_class)
+_Version: type[Version] | None = None
+
+
+@dataclass(frozen=True)
 class VersionInfo:
     path: str
     old_version: str
@@ -33,63 +56,262 @@ class bumpuvError(Exception):
     pass
 
 
-def load_pyproject_toml(path: Path) -> dict:
-    """Load pyproject.toml and return parsed content."""
-    if not path.exists():
-        raise bumpuvError(f"pyproject.toml not found in {path.parent}")
+@total_ordering
+@dataclass(frozen=True, eq=False)
+class _FastVersion:
+    """Subset of packaging.version.Version for N.N.N[{a|b|rc}N] versions."""
+
+    major: int
+    minor: int
+    micro: int
+    pre: tuple[str, int] | None
+
+    @property
+    def base_version(self) -> str:
+        return f"{self.major}.{self.minor}.{self.micro}"
+
+    @property
+    def is_prerelease(self) -> bool:
+        return self.pre is not None
+
+    def __str__(self) -> str:
+        if self.pre is None:
+            return self.base_version
+        return f"{self.base_version}{self.pre[0]}{self.pre[1]}"
+
+    def _key(self) -> tuple[int, int, int, int, int]:
+        # A final release sorts after all of its pre-releases
+        pre = (3, 0) if self.pre is None else (_PRE_ORDER[self.pre[0]], self.pre[1])
+        return (self.major, self.minor, self.micro, *pre)
+
+    def _operands(self, other: object) -> tuple[Any, Any] | None:
+        """Return comparable (self, other) values, or None if unsupported."""
+        if isinstance(other, _FastVersion):
+            return self._key(), other._key()
+        Version = _version_class()
+        if isinstance(other, Version):
+            return Version(str(self)), other
+        return None
+
+    def __eq__(self, other: object) -> bool:
+        operands = self._operands(other)
+        if operands is None:
+            return NotImplemented
+        return bool(operands[0] == operands[1])
+
+    def __lt__(self, other: object) -> bool:
+        operands = self._operands(other)
+        if operands is None:
+            return NotImplemented
+        return bool(operands[0] < operands[1])
+
+    def __hash__(self) -> int:
+        # Consistent with equality against packaging.version.Version
+        return hash(_version_class()(str(self)))
+
+
+def _toml_loads(text: str) -> dict[str, Any]:
+    """Parse TOML text, preferring rtoml when it is installed."""
+    try:
+        import rtoml
+    except ImportError:
+        try:
+            import tomllib
+        except ImportError:
+            import tomli as tomllib  # type: ignore[import-not-found,no-redef]
+        return tomllib.loads(text)
+    return rtoml.loads(text)
+
+
+def _toml_dumps(data: dict[str, Any]) -> str:
+    """Serialize data to TOML text, preferring rtoml when it is installed."""
+    try:
+        import rtoml
+    except ImportError:
+        import tomli_w
+
+        return tomli_w.dumps(data)
+    return rtoml.dumps(data)
+
+
+def _find_project_version(raw: bytes) -> re.Match[bytes] | None:
+    """Locate project.version for an in-place rewrite, or None to fall back."""
+    match = _VERSION_RE.search(raw)
+    # A multi-line string ahead of the key may hold a `version = "..."` line itself
+    if match and (b'"""' in match.group(0) or b"'''" in match.group(0)):
+        return None
+    return match
 
-    with open(path, "rb") as f:
-        data = tomllib.load(f)
+
+def load_pyproject_toml(path: str) -> dict[str, Any]:
+    """Load pyproject.toml and return parsed content."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        raise bumpuvError(f"pyproject.toml not found in {os.path.dirname(path)}")
+
+    key = (path, st.st_ino, st.st_mtime_ns, st.st_ctime_ns, st.st_size)
+    data = _PYPROJECT_CACHE.get(key)
+    if data is None:
+        with open(path, "rb") as f:
+            data = _toml_loads(f.read().decode())
+        _PYPROJECT_CACHE[key] = data
+        if len(_PYPROJECT_CACHE) > _PYPROJECT_CACHE_SIZE:
+            _PYPROJECT_CACHE.popitem(last=False)
+    else:
+        _PYPROJECT_CACHE.move_to_end(key)
 
     if "project" not in data or "version" not in data["project"]:
         raise bumpuvError("project.version not found in pyproject.toml")
 
-    return data
+    # Callers may modify the result, so never hand out the cached dict itself
+    return copy.deepcopy(data)
+
 
+def _write_file_atomic(path: str, content: bytes) -> None:
+    """Write content to a temporary file and rename it over path."""
+    # Replace the file a symlink points to, not the symlink itself
+    target = os.path.realpath(path)
+    try:
+        mode = os.stat(target).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
 
-def save_pyproject_toml(path: Path, data: dict) -> None:
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(target), prefix=f".{os.path.basename(target)}."
+    )
+    try:
+        try:
+            written = 0
+            while written < len(content):
+                written += os.write(fd, content[written:])
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        # mkstemp creates the file as 0o600; set the mode without the umask
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, target)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def save_pyproject_toml(path: str, data: dict[str, Any]) -> None:
     """Save data to pyproject.toml."""
-    with open(path, "wb") as f:
-        tomli_w.dump(data, f)
+    _write_file_atomic(path, _toml_dumps(data).encode())
+
+
+def _version_class() -> type[Version]:
+    """Return packaging.version.Version, importing it on first use."""
+    global _Version
+    if _Version is None:
+        from packaging.version import Version
+
+        _Version = Version
+    return _Version
 
 
-def validate_version(version_str: str) -> Version:
+def validate_version(version_str: str) -> _FastVersion | Version:
     """Validate version string according to PEP 440."""
+    match = _FAST_VERSION_RE.match(version_str)
+    if match:
+        major, minor, micro, pre_type, pre_num = match.groups()
+        pre = None if pre_type is None else (pre_type, int(pre_num))
+        return _FastVersion(int(major), int(minor), int(micro), pre)
+
+    from packaging.version import InvalidVersion
+
     try:
-        return Version(version_str)
+        return _version_class()(version_str)
     except InvalidVersion:
         raise bumpuvError(f"Invalid version format: {version_str}")
 
 
-def bump_version(current: Version, bump_type: str) -> Version:
+def _bump_major(current: _FastVersion | Version) -> _FastVersion | Version:
+    return _FastVersion(current.major + 1, 0, 0, None)
+
+
+def _bump_minor(current: _FastVersion | Version) -> _FastVersion | Version:
+    return _FastVersion(current.major, current.minor + 1, 0, None)
+
+
+def _bump_patch(current: _FastVersion | Version) -> _FastVersion | Version:
+    return _FastVersion(current.major, current.minor, current.micro + 1, None)
+
+
+def _bump(current: _FastVersion | Version) -> _FastVersion | Version:
+    if not current.is_prerelease:
+        # Same as patch
+        return _bump_patch(current)
+
+    # Increment pre-release number
+    pre = current.pre
+    if not pre:
+        raise bumpuvError("Cannot bump pre-release version without pre-release number")
+
+    pre_type, pre_num = pre
+    if isinstance(current, _FastVersion):
+        return _FastVersion(
+            current.major, current.minor, current.micro, (pre_type, pre_num + 1)
+        )
+    # Keep epoch and release segments exactly as packaging has them
+    return _version_class()(f"{current.base_version}{pre_type}{pre_num + 1}")
+
+
+_BUMPERS: dict[str, Callable[[_FastVersion | Version], _FastVersion | Version]] = {
+    "major": _bump_major,
+    "minor": _bump_minor,
+    "patch": _bump_patch,
+    "bump": _bump,
+}
+_BUMP_TYPES = frozenset(_BUMPERS)
+
+
+def bump_version(
+    current: _FastVersion | Version, bump_type: str
+) -> _FastVersion | Version:
     """Bump version according to type."""
-    if bump_type == "major":
-        return Version(f"{current.major + 1}.0.0")
-    elif bump_type == "minor":
-        return Version(f"{current.major}.{current.minor + 1}.0")
-    elif bump_type == "patch":
-        return Version(f"{current.major}.{current.minor}.{current.micro + 1}")
-    elif bump_type == "bump":
-        if current.is_prerelease:
-            # Increment pre-release number
-            pre = current.pre
-            if pre:
-                pre_type, pre_num = pre
-                return Version(f"{current.base_version}{pre_type}{pre_num + 1}")
-            else:
-                raise bumpuvError(
-                    "Cannot bump pre-release version without pre-release number"
-                )
-        else:
-            # Same as patch
-            return Version(f"{current.major}.{current.minor}.{current.micro + 1}")
-    else:
+    bumper = _BUMPERS.get(bump_type)
+    if bumper is None:
         raise bumpuvError(f"Unknown bump type: {bump_type}")
+    return bumper(current)
+
+
+def _git(*args: str, check: bool = False) -> subprocess.CompletedProcess[str]:
+    """Run a git command in the current directory and capture its output."""
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=check
+        )
+    except FileNotFoundError:
+        raise bumpuvError("git command not found")
+
 
+def _git_error(e: subprocess.CalledProcessError) -> str:
+    """Return the message of a failed git command (hooks may print to stdout)."""
+    return str(e.stderr or e.stdout or e).strip()
 
-def check_git_status(repo: git.Repo, dry_run: bool = False) -> None:
+
+def _restore_files(originals: dict[str, bytes], paths: list[str]) -> None:
+    """Write back original file contents and unstage paths after a failed update."""
+    for path, content in originals.items():
+        _write_file_atomic(path, content)
+    _git("reset", "-q", "--", *paths)
+
+
+def check_git_status(dry_run: bool = False) -> None:
     """Check git repository status."""
-    if repo.is_dirty(untracked_files=False):
+    try:
+        status = _git("status", "--porcelain", "--untracked-files=no", check=True)
+    except subprocess.CalledProcessError as e:
+        raise bumpuvError(f"Failed to get git status: {e.stderr.strip()}")
+
+    # Each line starts with XY: X is the index status, Y the work tree status
+    lines = status.stdout.splitlines()
+    unstaged = any(line[1] != " " for line in lines)
+    staged = any(line[0] not in " ?" for line in lines)
+
+    if unstaged:
         if dry_run:
             print(
                 f"{Fore.YELLOW}Warning: Repository has unstaged changes{Style.RESET_ALL}"
@@ -99,7 +321,7 @@ def check_git_status(repo: git.Repo, dry_run: bool = False) -> None:
                 "Repository has unstaged changes. Please commit before running"
             )
 
-    if repo.index.diff("HEAD"):
+    if staged:
         if dry_run:
             print(
                 f"{Fore.YELLOW}Warning: Repository has staged changes{Style.RESET_ALL}"
@@ -113,17 +335,30 @@ def check_git_status(repo: git.Repo, dry_run: bool = False) -> None:
 def update_version(new_version: str, dry_run: bool = False) -> VersionInfo:
     """Update version in pyproject.toml and create git commit and tag."""
     # Find pyproject.toml and uv.lock
-    pyproject_path = Path.cwd() / "pyproject.toml"
-    uv_lock_path = Path.cwd() / "uv.lock"
+    cwd = os.getcwd()
+    pyproject_path = os.path.join(cwd, "pyproject.toml")
+    uv_lock_path = os.path.join(cwd, "uv.lock")
 
     # Load and validate current version
-    data = load_pyproject_toml(pyproject_path)
-    current_version_str = data["project"]["version"]
+    try:
+        with open(pyproject_path, "rb") as f:
+            raw = f.read()
+    except FileNotFoundError:
+        raise bumpuvError(f"pyproject.toml not found in {cwd}")
+
+    match = _find_project_version(raw)
+    data: dict[str, Any] = {}
+    if match:
+        current_version_str = match.group(1).decode()
+    else:
+        # Unusual layout; fall back to a full TOML parse
+        data = load_pyproject_toml(pyproject_path)
+        current_version_str = data["project"]["version"]
     current_version = validate_version(current_version_str)
 
     # Validate new version
     if isinstance(new_version, str):
-        if new_version in ["major", "minor", "patch", "bump"]:
+        if new_version in _BUMP_TYPES:
             new_version_obj = bump_version(current_version, new_version)
         else:
             new_version_obj = validate_version(new_version)
@@ -136,13 +371,12 @@ def update_version(new_version: str, dry_run: bool = False) -> VersionInfo:
             f"New version {new_version_obj} must be greater than current version {current_version}"
         )
 
-    # Check git repository
-    try:
-        repo = git.Repo(".")
-    except git.InvalidGitRepositoryError:
+    # Check git repository; like git.Repo("."), parent directories are not searched
+    prefix = _git("rev-parse", "--show-prefix")
+    if prefix.returncode != 0 or prefix.stdout.strip():
         raise bumpuvError("Not a git repository")
 
-    check_git_status(repo, dry_run)
+    check_git_status(dry_run)
 
     # Prepare version info
     new_version_str = str(new_version_obj)
@@ -153,7 +387,7 @@ def update_version(new_version: str, dry_run: bool = False) -> VersionInfo:
     tag = f"{tag_prefix}{new_version_str}"
 
     version_info = VersionInfo(
-        path=str(pyproject_path.absolute()),
+        path=pyproject_path,
         old_version=current_version_str,
         new_version=new_version_str,
         commit_message=commit_message,
@@ -162,23 +396,52 @@ def update_version(new_version: str, dry_run: bool = False) -> VersionInfo:
 
     if not dry_run:
         # Update version using uv if uv.lock exists, otherwise update pyproject.toml directly
-        if uv_lock_path.exists():
+        has_uv_lock = os.path.exists(uv_lock_path)
+        paths = [pyproject_path]
+        if os.path.islink(pyproject_path):
+            # The rewrite goes to the link target, so stage that as well
+            paths.append(os.path.realpath(pyproject_path))
+        # Original contents, put back if the update cannot be committed
+        originals = {pyproject_path: raw}
+        if has_uv_lock:
+            paths.append(uv_lock_path)
+            with open(uv_lock_path, "rb") as f:
+                originals[uv_lock_path] = f.read()
+
+        if has_uv_lock:
             try:
-                subprocess.run(
-                    ["uv", "version", new_version_str], check=True, cwd=Path.cwd()
-                )
+                subprocess.run(["uv", "version", new_version_str], check=True, cwd=cwd)
             except subprocess.CalledProcessError as e:
+                _restore_files(originals, paths)
                 raise bumpuvError(f"Failed to update version with uv: {e}")
+        elif match:
+            # Rewrite only the version string, keeping the rest of the file as is
+            _write_file_atomic(
+                pyproject_path,
+                raw[: match.start(1)] + new_version_str.encode() + raw[match.end(1) :],
+            )
         else:
             # Update pyproject.toml directly
             data["project"]["version"] = new_version_str
             save_pyproject_toml(pyproject_path, data)
 
         # Git commit and tag
-        repo.index.add([str(pyproject_path)])
-        if uv_lock_path.exists():
-            repo.index.add([str(uv_lock_path)])
-        repo.index.commit(commit_message)
-        repo.create_tag(tag, message=commit_message)
+        try:
+            # uv.lock may be untracked, which `git commit -- <paths>` rejects
+            _git("add", "--", *paths, check=True)
+            _git("commit", "-m", commit_message, check=True)
+        except subprocess.CalledProcessError as e:
+            _restore_files(originals, paths)
+            raise bumpuvError(
+                f"Failed to create git commit: {_git_error(e)} "
+                "(the version change was reverted)"
+            )
+        try:
+            _git("tag", "-a", tag, "-m", commit_message, check=True)
+        except subprocess.CalledProcessError as e:
+            raise bumpuvError(
+                f"Committed {new_version_str} but failed to create tag {tag}: "
+                f"{_git_error(e)}"
+            )
 
     return version_info
@@ -1,7 +1,25 @@
+import copy
+import os
+import pickle
+
 import pytest
 from packaging.version import Version
 
-from ._core import bump_version, bumpuvError, validate_version
+try:
+    import tomllib
+except ImportError:
+    import tomli as tomllib  # type: ignore[import-not-found,no-redef]
+
+from ._core import (
+    VersionInfo,
+    _find_project_version,
+    _toml_dumps,
+    _toml_loads,
+    bump_version,
+    bumpuvError,
+    load_pyproject_toml,
+    validate_version,
+)
 
 
 def test_validate_version():
@@ -14,6 +32,8 @@ def test_validate_version():
     # Invalid versions
     with pytest.raises(bumpuvError):
         validate_version("invalid")
+    with pytest.raises(bumpuvError):
+        validate_version("\u0661.\u0662.\u0663")  # Arabic-Indic digits
 
 
 def test_bump_version():
@@ -51,3 +71,127 @@ def test_bump_invalid_type():
     v = Version("1.0.0")
     with pytest.raises(bumpuvError):
         bump_version(v, "invalid")
+
+
+def test_validate_version_fallback():
+    """Test versions outside the fast path are still parsed by packaging."""
+    assert validate_version("2.0") == Version("2.0")
+    assert validate_version("1.0.0.post1") == Version("1.0.0.post1")
+    assert validate_version("1.0.0.dev1") == Version("1.0.0.dev1")
+
+
+def test_version_ordering():
+    """Test ordering of fast-path versions, also against packaging versions."""
+    assert validate_version("1.0.0a1") < validate_version("1.0.0b1")
+    assert validate_version("1.0.0b1") < validate_version("1.0.0rc1")
+    assert validate_version("1.0.0rc1") < validate_version("1.0.0")
+    assert validate_version("1.0.0") < validate_version("1.0.0.post1")
+    assert validate_version("2.0") > validate_version("1.9.9")
+    assert validate_version("1.0.0") <= Version("1.0")
+
+
+def test_load_pyproject_toml_cache(tmp_path):
+    """Test cached pyproject data is copied and refreshed when the file changes."""
+    path = tmp_path / "pyproject.toml"
+    path.write_text('[project]\nname = "test-project"\nversion = "1.0.0"\n')
+
+    data = load_pyproject_toml(str(path))
+    data["project"]["version"] = "9.9.9"
+    assert load_pyproject_toml(str(path))["project"]["version"] == "1.0.0"
+
+    path.write_text('[project]\nname = "test-project"\nversion = "1.0.10"\n')
+    assert load_pyproject_toml(str(path))["project"]["version"] == "1.0.10"
+
+
+def test_load_pyproject_toml_cache_same_size_replace(tmp_path):
+    """Test a same-size replacement with an unchanged mtime is not served stale."""
+    path = tmp_path / "pyproject.toml"
+    path.write_text('[project]\nname = "test-project"\nversion = "1.0.0"\n')
+    assert load_pyproject_toml(str(path))["project"]["version"] == "1.0.0"
+    mtime_ns = path.stat().st_mtime_ns
+
+    # Replace the file the way _write_file_atomic does, keeping size and mtime
+    new_path = tmp_path / "pyproject.toml.new"
+    new_path.write_text('[project]\nname = "test-project"\nversion = "1.0.1"\n')
+    os.utime(new_path, ns=(mtime_ns, mtime_ns))
+    os.replace(new_path, path)
+    assert path.stat().st_mtime_ns == mtime_ns
+
+    assert load_pyproject_toml(str(path))["project"]["version"] == "1.0.1"
+
+
+def test_version_info_copy_and_pickle():
+    """Test VersionInfo survives copy and pickle round trips."""
+    info = VersionInfo(
+        path="/tmp/pyproject.toml",
+        old_version="1.0.0",
+        new_version="1.0.1",
+        commit_message="1.0.1",
+        tag="v1.0.1",
+    )
+
+    assert copy.copy(info) == info
+    assert copy.deepcopy(info) == info
+    assert pickle.loads(pickle.dumps(info)) == info
+
+
+def test_version_copy_and_pickle():
+    """Test validated versions survive copy and pickle round trips."""
+    for version_str in ("1.0.0", "1.0.0rc1", "1.0.0.post1"):
+        v = validate_version(version_str)
+        assert copy.deepcopy(v) == v
+        assert pickle.loads(pickle.dumps(v)) == v
+
+
+@pytest.mark.parametrize(
+    ("content", "expected"),
+    [
+        ('[project]\nname = "x"\nversion = "1.0.0"\n', "1.0.0"),
+        (
+            '# comment\n[project]  # table\nversion   =   "1.0.0"\n'
+            '[tool.x]\nversion = "2"\n',
+            "1.0.0",
+        ),
+        ('[project]\nkeywords = [\n  "a",\n]\nversion = "1.0.0"\n', "1.0.0"),
+        # No project.version; the key in [tool.x] must not be used
+        ('[project]\nname = "x"\n[tool.x]\nversion = "2.0.0"\n', None),
+        # Multi-line strings ahead of the key force the TOML fallback
+        (
+            '[project]\ndescription = """\nversion = "9.9.9"\n"""\nversion = "1.0.0"\n',
+            None,
+        ),
+        (
+            "[project]\ndescription = '''\nversion = \"9.9.9\"\n'''\n"
+            'version = "1.0.0"\n',
+            None,
+        ),
+        # Literal strings are left to the TOML fallback
+        ("[project]\nversion = '1.0.0'\n", None),
+    ],
+)
+def test_find_project_version(content, expected):
+    """Test the in-place match, or the fallback, for each layout."""
+    match = _find_project_version(content.encode())
+    if expected is None:
+        assert match is None
+    else:
+        assert match is not None
+        assert match.group(1).decode() == expected
+        assert tomllib.loads(content)["project"]["version"] == expected
+
+
+def test_toml_roundtrip_with_rtoml():
+    """Test the rtoml-backed fallback output stays compatible with tomllib."""
+    rtoml = pytest.importorskip("rtoml")
+    data = {
+        "project": {"name": "test-project", "version": "1.0.0", "keywords": ["a"]},
+        "tool": {"example": {"enabled": True}},
+    }
+
+    text = _toml_dumps(data)
+
+    assert text == rtoml.dumps(data)
+    assert _toml_loads(text) == data
+    assert tomllib.loads(text) == data
+    # Strings stay double-quoted, so the next bump can rewrite in place
+    assert _find_project_version(text.encode()) is not None
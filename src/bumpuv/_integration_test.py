@@ -193,6 +193,37 @@ def test_staged_changes_error(temp_project):
         update_version("patch")
 
 
+def test_commit_failure_reverts_version(temp_project):
+    """Test a failed git commit leaves pyproject.toml unchanged and unstaged."""
+    project_dir, repo = temp_project
+
+    hook = project_dir / ".git" / "hooks" / "pre-commit"
+    hook.parent.mkdir(exist_ok=True)
+    hook.write_text("#!/bin/sh\necho 'rejected by hook' >&2\nexit 1\n")
+    hook.chmod(0o755)
+    original_content = Path("pyproject.toml").read_text()
+
+    with pytest.raises(bumpuvError, match="rejected by hook.*reverted"):
+        update_version("patch")
+
+    assert Path("pyproject.toml").read_text() == original_content
+    assert not repo.is_dirty()
+    assert repo.head.commit.message.strip() == "Initial commit"
+    assert len(list(repo.tags)) == 0
+
+
+def test_tag_failure_reports_commit(temp_project):
+    """Test a failed git tag reports that the commit was already made."""
+    project_dir, repo = temp_project
+
+    repo.create_tag("v1.0.1")
+
+    with pytest.raises(bumpuvError, match="Committed 1.0.1 but failed to create tag"):
+        update_version("patch")
+
+    assert repo.head.commit.message.strip() == "1.0.1"
+
+
 def test_no_pyproject_toml_error():
     """Test error when pyproject.toml doesn't exist."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -241,6 +272,119 @@ description = "Test project"
             os.chdir(original_cwd)
 
 
+def test_version_bump_preserves_formatting(temp_project):
+    """Test that only the project version string is rewritten."""
+    project_dir, repo = temp_project
+
+    pyproject_content = """# Leading comment
+[project]
+name   = "test-project"  # aligned
+version = "1.0.0"
+description = "Test project"
+
+[tool.example]
+version = "9.9.9"
+"""
+    Path("pyproject.toml").write_text(pyproject_content)
+    repo.index.add(["pyproject.toml"])
+    repo.index.commit("Add formatting")
+
+    update_version("patch")
+
+    assert Path("pyproject.toml").read_text() == pyproject_content.replace(
+        'version = "1.0.0"', 'version = "1.0.1"'
+    )
+    assert sorted(p.name for p in project_dir.iterdir()) == [".git", "pyproject.toml"]
+
+
+def test_version_in_multiline_string_ignored(temp_project):
+    """Test a version line inside a multi-line string is not rewritten."""
+    project_dir, repo = temp_project
+
+    Path("pyproject.toml").write_text('''[project]
+name = "test-project"
+description = """
+version = "9.9.9"
+"""
+version = "1.0.0"
+''')
+    repo.index.add(["pyproject.toml"])
+    repo.index.commit("Add description")
+
+    result = update_version("patch")
+
+    assert result.old_version == "1.0.0"
+    assert result.new_version == "1.0.1"
+    with open("pyproject.toml", "rb") as f:
+        data = tomllib.load(f)
+    assert data["project"]["version"] == "1.0.1"
+    assert data["project"]["description"] == 'version = "9.9.9"\n'
+
+
+def test_version_bump_toml_fallback(temp_project):
+    """Test a layout the in-place rewrite does not handle falls back to TOML."""
+    project_dir, repo = temp_project
+
+    Path("pyproject.toml").write_text("""[project]
+name = "test-project"
+version = '1.0.0'
+""")
+    repo.index.add(["pyproject.toml"])
+    repo.index.commit("Use literal string")
+
+    result = update_version("patch")
+
+    assert result.old_version == "1.0.0"
+    assert result.new_version == "1.0.1"
+    with open("pyproject.toml", "rb") as f:
+        data = tomllib.load(f)
+    assert data["project"]["version"] == "1.0.1"
+
+
+def test_version_bump_keeps_symlink_and_mode(temp_project):
+    """Test pyproject.toml is written through a symlink and keeps its mode."""
+    project_dir, repo = temp_project
+
+    real_path = project_dir / "real-pyproject.toml"
+    Path("pyproject.toml").rename(real_path)
+    Path("pyproject.toml").symlink_to(real_path.name)
+    real_path.chmod(0o664)
+    Path("pyproject.toml.tmp").write_text("user file")
+    repo.index.add(["pyproject.toml", str(real_path), "pyproject.toml.tmp"])
+    repo.index.commit("Use symlink")
+
+    update_version("patch")
+
+    assert Path("pyproject.toml").is_symlink()
+    assert 'version = "1.0.1"' in real_path.read_text()
+    assert real_path.stat().st_mode & 0o777 == 0o664
+    assert Path("pyproject.toml.tmp").read_text() == "user file"
+
+
+def test_version_outside_project_table_ignored():
+    """Test that a version key in another table is not used as project.version."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_dir = Path(tmpdir) / "no_version_project"
+        project_dir.mkdir()
+
+        pyproject_content = """[project]
+name = "test-project"
+
+[tool.example]
+version = "1.0.0"
+"""
+        (project_dir / "pyproject.toml").write_text(pyproject_content)
+
+        original_cwd = os.getcwd()
+        os.chdir(project_dir)
+
+        try:
+            with pytest.raises(bumpuvError, match="project.version not found"):
+                update_version("patch")
+        finally:
+            os.chdir(original_cwd)
+
+
 def test_not_git_repo_error():
     """Test error when not in git repository."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -266,6 +410,24 @@ description = "Test project"
             os.chdir(original_cwd)
 
 
+def test_project_in_git_subdirectory_error(temp_project):
+    """Test error when the git repository is in a parent directory."""
+    project_dir, repo = temp_project
+
+    sub_dir = project_dir / "sub"
+    sub_dir.mkdir()
+    (sub_dir / "pyproject.toml").write_text("""[project]
+name = "sub-project"
+version = "1.0.0"
+""")
+    repo.index.add([str(sub_dir / "pyproject.toml")])
+    repo.index.commit("Add sub project")
+    os.chdir(sub_dir)
+
+    with pytest.raises(bumpuvError, match="Not a git repository"):
+        update_version("patch")
+
+
 def test_invalid_version_error(temp_project):
     """Test error with invalid version format."""
     project_dir, repo = temp_project
@@ -293,6 +455,21 @@ def test_dry_run_with_unstaged_changes(temp_project, capsys):
     assert "Warning: Repository has unstaged changes" in captured.out
 
 
+def test_dry_run_with_staged_changes(temp_project, capsys):
+    """Test dry-run mode reports staged changes separately from unstaged ones."""
+    project_dir, repo = temp_project
+
+    # Create and stage change
+    Path("test_file.txt").write_text("test")
+    repo.index.add(["test_file.txt"])
+
+    update_version("patch", dry_run=True)
+
+    captured = capsys.readouterr()
+    assert "Warning: Repository has staged changes" in captured.out
+    assert "unstaged changes" not in captured.out
+
+
 @pytest.fixture
 def temp_project_with_uv_lock():
     """Create a temporary project with pyproject.toml, uv.lock and git repo."""
@@ -341,7 +518,7 @@ def test_version_bump_with_uv_lock(temp_project_with_uv_lock, monkeypatch):
     project_dir, repo = temp_project_with_uv_lock
 
     # Mock subprocess.run to simulate uv version command
-    # import subprocess
+    original_run = subprocess.run
 
     def mock_run(cmd, **kwargs):
         if cmd == ["uv", "version", "1.0.1"]:
@@ -358,7 +535,7 @@ def test_version_bump_with_uv_lock(temp_project_with_uv_lock, monkeypatch):
             with open("uv.lock", "w") as f:
                 f.write(content)
             return subprocess.CompletedProcess(cmd, 0)
-        return subprocess.run(cmd, **kwargs)
+        return original_run(cmd, **kwargs)
 
     monkeypatch.setattr(subprocess, "run", mock_run)
 
@@ -377,3 +554,31 @@ def test_version_bump_with_uv_lock(temp_project_with_uv_lock, monkeypatch):
     # Verify git commit includes both files
     assert repo.head.commit.message.strip() == "1.0.1"
     assert "v1.0.1" in [tag.name for tag in repo.tags]
+
+
+def test_version_bump_with_untracked_uv_lock(temp_project, monkeypatch):
+    """Test an untracked uv.lock is added to the version commit."""
+    project_dir, repo = temp_project
+
+    Path("uv.lock").write_text("version = 1\n")
+
+    original_run = subprocess.run
+
+    def mock_run(cmd, **kwargs):
+        if cmd == ["uv", "version", "1.0.1"]:
+            content = Path("pyproject.toml").read_text()
+            Path("pyproject.toml").write_text(
+                content.replace('version = "1.0.0"', 'version = "1.0.1"')
+            )
+            return subprocess.CompletedProcess(cmd, 0)
+        return original_run(cmd, **kwargs)
+
+    monkeypatch.setattr(subprocess, "run", mock_run)
+
+    result = update_version("patch")
+
+    assert result.tag == "v1.0.1"
+    assert repo.head.commit.message.strip() == "1.0.1"
+    assert "uv.lock" in repo.head.commit.tree
+    assert "v1.0.1" in [tag.name for tag in repo.tags]
+    assert not repo.is_dirty()
@@ -0,0 +1,51 @@
+import pytest
+
+from .__main__ import HELP, _parse
+
+
+def test_parse_defaults():
+    """Test no arguments means bump without dry-run."""
+    assert _parse([]) == ("bump", False)
+
+
+def test_parse_help(capsys):
+    """Test -h, --help and its prefixes print help and exit."""
+    for argv in (["-h"], ["--help"], ["--he"], ["patch", "-nh"]):
+        with pytest.raises(SystemExit) as excinfo:
+            _parse(argv)
+        assert excinfo.value.code == 0
+        assert capsys.readouterr().out == HELP
+
+
+def test_parse_dry_run():
+    """Test -n, --dry-run and its prefixes."""
+    assert _parse(["-n"]) == ("bump", True)
+    assert _parse(["minor", "--dry-run"]) == ("minor", True)
+    assert _parse(["--dry", "1.0.0"]) == ("1.0.0", True)
+
+
+def test_parse_extra_positional(capsys):
+    """Test an extra positional argument is rejected like argparse does."""
+    with pytest.raises(SystemExit) as excinfo:
+        _parse(["major", "minor"])
+    assert excinfo.value.code == 2
+    assert "unrecognized arguments: minor" in capsys.readouterr().err
+
+
+def test_parse_unknown_option(capsys):
+    """Test an unknown option is rejected."""
+    with pytest.raises(SystemExit) as excinfo:
+        _parse(["--bogus"])
+    assert excinfo.value.code == 2
+    assert "unrecognized arguments: --bogus" in capsys.readouterr().err
+
+
+def test_parse_separator():
+    """Test arguments after -- are positional."""
+    assert _parse(["--", "-n"]) == ("-n", False)
+    assert _parse(["-n", "--", "patch"]) == ("patch", True)
+
+
+def test_parse_empty_argument():
+    """Test an empty version is passed through instead of defaulting to bump."""
+    assert _parse([""]) == ("", False)